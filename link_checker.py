@@ -13,6 +13,49 @@ from typing import Dict, List, Tuple, Optional, Set
 from urllib.parse import urljoin, urlparse
 import difflib
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # Optional: fast C++ prefilter for closest-match suggestions
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+try:
+    # Optional: faster JSON serialization for the detailed results file
+    import orjson
+except ImportError:
+    orjson = None
+
+# Single combined link pattern, compiled once at import time, so each file
+# is scanned in one pass:
+#   markdown links [text](url), href attributes in components,
+#   src attributes in images
+# The markdown text and URL classes exclude '[' so a failed attempt stops at
+# the next '[' instead of rescanning to the end of the file; this keeps the
+# scan linear on content with many unclosed brackets.
+LINK_RE = re.compile(
+    r'\[(?P<text>[^\[\]]*)\]\((?P<markdown>[^)\[]+)\)'
+    r'|href=["\'](?P<href>[^"\']+)["\']'
+    r'|src=["\'](?P<src>[^"\']+)["\']'
+)
+
+# Literal substrings every match of LINK_RE must contain
+LINK_MARKERS = ("](", "href=", "src=")
+
+def canonical_path(url: str) -> str:
+    """Normalize an internal URL path to the form stored in the file index"""
+    # Drop anchor and query string
+    path = url.split("#")[0].split("?")[0]
+    # Pages are served without a trailing slash, and index pages at their folder
+    path = path.rstrip("/")
+    if path == "/index" or path.endswith("/index"):
+        path = path[:-len("/index")]
+    return path or "/"
+
+def similarity(a: str, b: str) -> float:
+    """Similarity ratio between two strings, from 0.0 to 1.0"""
+    return difflib.SequenceMatcher(None, a, b).ratio()
 
 class LinkChecker:
     def __init__(self, docs_dir: str = "."):
@@ -20,7 +63,10 @@ class LinkChecker:
         self.fixes_applied = []
         self.broken_links = []
         self.external_cache = {}
+        self.internal_cache = {}
         self.file_list = []
+        self.url_paths = frozenset()
+        self.url_path_list = []
         self.nav_structure = {}
         
         # Load navigation structure from docs.json
@@ -34,53 +80,47 @@ class LinkChecker:
     
     def build_file_list(self):
         """Build a list of all MDX files and their paths"""
+        url_paths = set(self.url_paths)
         for file_path in self.docs_dir.rglob("*.mdx"):
             relative_path = file_path.relative_to(self.docs_dir)
             # Convert file path to URL path (remove .mdx extension)
-            url_path = "/" + str(relative_path).replace(".mdx", "")
+            url_path = canonical_path("/" + str(relative_path).replace(".mdx", ""))
             self.file_list.append({
                 "file_path": file_path,
                 "url_path": url_path,
                 "relative_path": relative_path
             })
+            url_paths.add(url_path)
+            self.url_path_list.append(url_path)
+        
+        # The index is only read during validation, so freeze it
+        self.url_paths = frozenset(url_paths)
     
     def extract_links(self, content: str) -> List[Dict]:
         """Extract all links from MDX content"""
         links = []
         
-        # Pattern for markdown links [text](url)
-        markdown_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-        for match in re.finditer(markdown_pattern, content):
-            links.append({
-                "text": match.group(1),
-                "url": match.group(2),
-                "type": "markdown",
-                "start": match.start(),
-                "end": match.end(),
-                "full_match": match.group(0)
-            })
+        # Cheap substring prefilter: skip the regex scan for content that
+        # cannot contain a link
+        if not any(marker in content for marker in LINK_MARKERS):
+            return links
         
-        # Pattern for href attributes in components
-        href_pattern = r'href=["\']([^"\']+)["\']'
-        for match in re.finditer(href_pattern, content):
-            links.append({
-                "text": "",
-                "url": match.group(1),
-                "type": "href",
-                "start": match.start(),
-                "end": match.end(),
-                "full_match": match.group(0)
-            })
+        # Matches come in document order, so line numbers are tracked by
+        # counting only the newlines since the previous match
+        line = 1
+        pos = 0
         
-        # Pattern for src attributes in images
-        src_pattern = r'src=["\']([^"\']+)["\']'
-        for match in re.finditer(src_pattern, content):
+        for match in LINK_RE.finditer(content):
+            link_type = match.lastgroup
+            line += content.count("\n", pos, match.start())
+            pos = match.start()
             links.append({
-                "text": "",
-                "url": match.group(1),
-                "type": "src",
+                "text": match.group("text") or "",
+                "url": match.group(link_type),
+                "type": link_type,
                 "start": match.start(),
                 "end": match.end(),
+                "line": line,
                 "full_match": match.group(0)
             })
         
@@ -88,40 +128,61 @@ class LinkChecker:
     
     def classify_link(self, url: str) -> str:
         """Classify link type"""
-        if url.startswith("#"):
+        # Dispatch on the first character so most links need a single compare
+        first = url[:1]
+        if first == "#":
             return "anchor"
-        elif url.startswith("http://") or url.startswith("https://"):
+        elif first == "h" and (url.startswith("https://") or url.startswith("http://")):
             return "external"
-        elif url.startswith("/"):
+        elif first == "/":
             return "internal_absolute"
-        elif url.startswith("./") or url.startswith("../"):
+        elif first == "." and (url.startswith("./") or url.startswith("../")):
             return "internal_relative"
         else:
             return "unknown"
     
     def check_internal_link(self, url: str) -> Tuple[bool, Optional[str]]:
         """Check if internal link exists and suggest fixes"""
-        # Remove anchor part for file existence check
-        file_path = url.split("#")[0]
+        # Fast path: the URL is already in canonical form and exists
+        if url in self.url_paths:
+            return True, None
+        
+        # Reduce the URL to its canonical form, so a single lookup is enough
+        file_path = canonical_path(url)
+        
+        if file_path in self.internal_cache:
+            return self.internal_cache[file_path]
         
         # Check if file exists directly
-        for file_info in self.file_list:
-            if file_info["url_path"] == file_path:
-                return True, None
+        if file_path in self.url_paths:
+            self.internal_cache[file_path] = (True, None)
+            return True, None
         
         # Check for common variations
+        url_paths = self.url_path_list
+        if process is not None:
+            # rapidfuzz's LCS-based ratio is never below difflib's ratio, so it
+            # only discards paths that cannot pass the threshold. Survivors are
+            # re-scored with difflib (in file order), so suggestions are the
+            # same whether or not rapidfuzz is installed.
+            prefiltered = process.extract(file_path, url_paths, scorer=fuzz.ratio,
+                                          processor=None, score_cutoff=84, limit=None)
+            url_paths = [url_paths[index] for _, _, index in sorted(prefiltered, key=lambda m: m[2])]
+        
         candidates = []
-        for file_info in self.file_list:
+        for url_path in url_paths:
             # Calculate similarity
-            similarity = difflib.SequenceMatcher(None, file_path, file_info["url_path"]).ratio()
-            if similarity > 0.85:  # 85% similarity threshold
-                candidates.append((file_info["url_path"], similarity))
+            ratio = similarity(file_path, url_path)
+            if ratio > 0.85:  # 85% similarity threshold
+                candidates.append((url_path, ratio))
         
         if candidates:
             # Sort by similarity and return best match
             candidates.sort(key=lambda x: x[1], reverse=True)
+            self.internal_cache[file_path] = (False, candidates[0][0])
             return False, candidates[0][0]
         
+        self.internal_cache[file_path] = (False, None)
         return False, None
     
     def check_external_link(self, url: str) -> Tuple[bool, Optional[str]]:
@@ -155,23 +216,57 @@ class LinkChecker:
             self.external_cache[url] = (False, str(e))
             return False, str(e)
     
-    def check_file_links(self, file_path: Path) -> List[Dict]:
-        """Check all links in a file"""
+    def check_host_links(self, urls: List[str]):
+        """Check external links on a single host, one request at a time"""
+        for url in urls:
+            print(f"Checking external link: {url}")
+            self.check_external_link(url)
+    
+    def prefetch_external_links(self, urls, max_workers: int = 16):
+        """Check external links concurrently and store the results in the cache"""
+        pending = sorted({url for url in urls if url not in self.external_cache})
+        if not pending:
+            return
+        
+        # Group by host: hosts are checked concurrently, but each host still
+        # sees sequential requests so we don't trip its rate limits
+        by_host = {}
+        for url in pending:
+            by_host.setdefault(urlparse(url).hostname, []).append(url)
+        
+        print(f"Checking {len(pending)} external links on {len(by_host)} hosts...")
+        # HEAD requests are network-bound, so threads overlap the waiting
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.check_host_links, by_host.values()))
+    
+    def read_file_links(self, file_path: Path) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Read a file and extract its links, returning (links, error)"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
         except Exception as e:
-            return [{"error": f"Could not read file: {e}"}]
+            return None, f"Could not read file: {e}"
+        
+        return self.extract_links(content), None
+    
+    def check_file_links(self, file_path: Path, links: Optional[List[Dict]] = None,
+                         error: Optional[str] = None) -> List[Dict]:
+        """Check all links in a file"""
+        if links is None and error is None:
+            links, error = self.read_file_links(file_path)
+        if error:
+            return [{"error": error}]
         
-        links = self.extract_links(content)
         results = []
+        # One shared string for every result of this file
+        file_name = str(file_path)
         
         for link in links:
             url = link["url"]
             link_type = self.classify_link(url)
             
             result = {
-                "file": str(file_path),
+                "file": file_name,
                 "link": link,
                 "link_type": link_type,
                 "valid": True,
@@ -184,7 +279,7 @@ class LinkChecker:
                 result["valid"] = valid
                 result["suggestion"] = suggestion
                 if suggestion:
-                    result["confidence"] = "high" if difflib.SequenceMatcher(None, url, suggestion).ratio() > 0.9 else "medium"
+                    result["confidence"] = "high" if similarity(url, suggestion) > 0.9 else "medium"
             
             elif link_type == "external":
                 valid, error = self.check_external_link(url)
@@ -202,17 +297,8 @@ class LinkChecker:
         
         return results
     
-    def apply_fix(self, file_path: Path, link_result: Dict) -> bool:
-        """Apply a fix to a broken link"""
-        if link_result["valid"] or not link_result["suggestion"]:
-            return False
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            return False
-        
+    def replace_link(self, content: str, link_result: Dict) -> str:
+        """Return content with a broken link replaced by its suggestion"""
         link = link_result["link"]
         old_url = link["url"]
         new_url = link_result["suggestion"]
@@ -221,33 +307,60 @@ class LinkChecker:
         if link["type"] == "markdown":
             old_link = f'[{link["text"]}]({old_url})'
             new_link = f'[{link["text"]}]({new_url})'
-            new_content = content.replace(old_link, new_link)
+            return content.replace(old_link, new_link)
         elif link["type"] == "href":
             old_href = f'href="{old_url}"'
             new_href = f'href="{new_url}"'
-            new_content = content.replace(old_href, new_href)
-        else:
-            return False
+            return content.replace(old_href, new_href)
         
-        # Only apply if content changed
-        if new_content != content:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                
-                # Track the fix
-                self.fixes_applied.append({
-                    "file": str(file_path),
-                    "old_url": old_url,
-                    "new_url": new_url,
+        return content
+    
+    def apply_fixes(self, file_path: Path, link_results: List[Dict]) -> int:
+        """Apply fixes to the broken links of a file, reading and writing it once"""
+        link_results = [link_result for link_result in link_results
+                        if not link_result["valid"] and link_result["suggestion"]]
+        if not link_results:
+            return 0
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            return 0
+        
+        new_content = content
+        fixes = []
+        file_name = str(file_path)
+        for link_result in link_results:
+            fixed_content = self.replace_link(new_content, link_result)
+            
+            # Only count the fix if content changed
+            if fixed_content != new_content:
+                new_content = fixed_content
+                fixes.append({
+                    "file": file_name,
+                    "old_url": link_result["link"]["url"],
+                    "new_url": link_result["suggestion"],
                     "confidence": link_result["confidence"],
                     "type": link_result["link_type"]
                 })
-                return True
-            except Exception as e:
-                return False
         
-        return False
+        if not fixes:
+            return 0
+        
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+        except Exception as e:
+            return 0
+        
+        # Track the fixes
+        self.fixes_applied.extend(fixes)
+        return len(fixes)
+    
+    def apply_fix(self, file_path: Path, link_result: Dict) -> bool:
+        """Apply a fix to a broken link"""
+        return self.apply_fixes(file_path, [link_result]) == 1
     
     def check_all_links(self) -> Dict:
         """Check all links in all MDX files"""
@@ -260,15 +373,28 @@ class LinkChecker:
             "detailed_results": []
         }
         
-        mdx_files = list(self.docs_dir.rglob("*.mdx"))
+        # Reuse the file list built at startup instead of walking the tree again
+        mdx_files = [file_info["file_path"] for file_info in self.file_list]
         results["total_files"] = len(mdx_files)
         
+        # Extract links from every file first, so all external links can be
+        # checked concurrently before the (sequential) validation pass
+        file_links = {file_path: self.read_file_links(file_path) for file_path in mdx_files}
+        
+        self.prefetch_external_links(
+            link["url"]
+            for links, error in file_links.values() if links
+            for link in links
+            if self.classify_link(link["url"]) == "external"
+        )
+        
         for file_path in mdx_files:
             print(f"Checking links in: {file_path}")
-            file_results = self.check_file_links(file_path)
+            links, error = file_links[file_path]
+            file_results = self.check_file_links(file_path, links, error)
             
             file_broken = 0
-            file_fixed = 0
+            to_fix = []
             
             for link_result in file_results:
                 if "error" in link_result:
@@ -283,9 +409,11 @@ class LinkChecker:
                     
                     # Apply fix if confidence is high or medium
                     if link_result["confidence"] in ["high", "medium"] and link_result["suggestion"]:
-                        if self.apply_fix(file_path, link_result):
-                            results["fixed_links"] += 1
-                            file_fixed += 1
+                        to_fix.append(link_result)
+            
+            # Write all of this file's fixes in one read/write
+            file_fixed = self.apply_fixes(file_path, to_fix)
+            results["fixed_links"] += file_fixed
             
             if file_fixed > 0:
                 results["files_modified"] += 1
@@ -320,13 +448,12 @@ class LinkChecker:
 ## Remaining Broken Links
 """
         
-        remaining_broken = [link for link in self.broken_links if not any(
-            fix["old_url"] == link["link"]["url"] and fix["file"] == link["file"]
-            for fix in self.fixes_applied
-        )]
+        fixed = {(fix["file"], fix["old_url"]) for fix in self.fixes_applied}
+        remaining_broken = [link for link in self.broken_links
+                            if (link["file"], link["link"]["url"]) not in fixed]
         
         for link in remaining_broken:
-            report += f"- **{link['file']}**: `{link['link']['url']}` ({link['link_type']})\n"
+            report += f"- **{link['file']}:{link['link']['line']}**: `{link['link']['url']}` ({link['link_type']})\n"
         
         return report
 
@@ -350,12 +477,17 @@ def main():
         f.write(report)
     
     # Save detailed results as JSON
-    with open("link_check_results.json", "w") as f:
-        json.dump({
-            "summary": results,
-            "fixes_applied": checker.fixes_applied,
-            "broken_links": checker.broken_links
-        }, f, indent=2)
+    detailed = {
+        "summary": results,
+        "fixes_applied": checker.fixes_applied,
+        "broken_links": checker.broken_links
+    }
+    if orjson is not None:
+        with open("link_check_results.json", "wb") as f:
+            f.write(orjson.dumps(detailed, option=orjson.OPT_INDENT_2))
+    else:
+        with open("link_check_results.json", "w") as f:
+            json.dump(detailed, f, indent=2)
     
     print(f"\n📋 Report saved to: link_check_report.md")
     print(f"📋 Detailed results saved to: link_check_results.json")